@@ -0,0 +1,42 @@
+using System;
+
+/// <summary>
+/// Player and team stats computed over every frame tracked this session.
+/// Distances are in metres, speeds in m/s, accelerations in m/s^2.
+/// </summary>
+[System.Serializable]
+public class StatsResult
+{
+    public PlayerStats[] players;
+    public TeamStats[] teams;
+    // Heatmap grid as [rows, cols]; heatmaps are row-major seconds per cell.
+    public int[] heatmap_shape;
+}
+
+[System.Serializable]
+public class PlayerStats
+{
+    public int id;
+    public int cls_id;
+    public float distance;
+    public float max_speed;
+    public float mean_speed;
+    public float max_acceleration;
+    public float max_deceleration;
+    public int accelerations;
+    public int decelerations;
+    public int sprints;
+    // Distance per speed zone: walk, jog, run, high-speed run, sprint.
+    public float[] zone_distance;
+    public float[] heatmap;
+}
+
+[System.Serializable]
+public class TeamStats
+{
+    public int cls_id;
+    public float distance;
+    public int sprints;
+    public float[] zone_distance;
+    public float[] heatmap;
+}
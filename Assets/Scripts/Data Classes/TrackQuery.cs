@@ -0,0 +1,35 @@
+using System;
+
+/// <summary>
+/// Query against the Python-side track store.
+/// type is "positions" (ids, start_frame, end_frame), "region" (region, src, start_frame, end_frame)
+/// or "nearest" (c, src, start_frame).
+/// Example JSON format: {"query_id":1, "type":"nearest", "c":[x,y], "src":0, "start_frame":7200}
+/// </summary>
+[System.Serializable]
+public class TrackQuery
+{
+    public int query_id;
+    public string type;
+    public int[] ids;
+    public long start_frame;
+    public long end_frame;
+    // Image rectangle [x0, y0, x1, y1] on camera src.
+    public float[] region;
+    public float[] c;
+    public int src;
+}
+
+/// <summary>
+/// Answer to a TrackQuery. Only the fields for the query's type are set.
+/// </summary>
+[System.Serializable]
+public class TrackQueryResult
+{
+    public int query_id;
+    public FrameTrackingData[] tracks;
+    public int[] ids;
+    public TrackObject nearest;
+    public float distance;
+    public string error;
+}
@@ -13,9 +13,13 @@ public class TrackingManager : MonoBehaviour, IDebuggable
     public YoloData YoloData { get; private set; }
     public FrameTrackingData[] ByteTrackData { get; private set; }
     public FrameTrackingData OldMaxFrameData { get; private set; }
+    public StatsResult Stats { get; private set; }
+    public event Action<TrackQueryResult> QueryAnswered;
     public bool IsReady { get; private set; }
 
     private TrackRequest requestData;
+    private readonly Queue<TrackQuery> pendingQueries = new Queue<TrackQuery>();
+    private int nextQueryId = 1;
 
     private OverlayControllersManager overlayControllersManager;
     private VideoControlSlider videoControlSlider;
@@ -156,6 +160,33 @@ public class TrackingManager : MonoBehaviour, IDebuggable
         return requestData;
     }
 
+    /// <summary>
+    /// Queues a query for the Python-side track store and returns its id.
+    /// The answer arrives through QueryAnswered.
+    /// </summary>
+    public int Query(TrackQuery query)
+    {
+        query.query_id = nextQueryId++;
+        pendingQueries.Enqueue(query);
+        return query.query_id;
+    }
+
+    /// <summary>
+    /// Returns the next pending track store query, or null if there is none.
+    /// </summary>
+    public TrackQuery GetQuery()
+    {
+        return pendingQueries.Count > 0 ? pendingQueries.Dequeue() : null;
+    }
+
+    public void OnQueryResult(TrackQueryResult queryResult)
+    {
+        if (!string.IsNullOrEmpty(queryResult.error))
+            Debug.LogWarning("TrackingManager::OnQueryResult: " + queryResult.error);
+
+        QueryAnswered?.Invoke(queryResult);
+    }
+
     public void OnReceive(UpdateResult updateResult)
     {
         string jsonResult = JsonConvert.SerializeObject(updateResult, Formatting.Indented);
@@ -175,6 +206,17 @@ public class TrackingManager : MonoBehaviour, IDebuggable
         //GoToAndStop(updateResult.lost_frame_id,false);
     }
 
+    public void OnReceiveStats(StatsResult statsResult)
+    {
+        Stats = statsResult;
+
+        foreach (var player in statsResult.players)
+        {
+            Debug.Log($"Player {player.id} (team {player.cls_id}): {player.distance:F0} m, " +
+                      $"max {player.max_speed:F1} m/s, {player.sprints} sprints");
+        }
+    }
+
     /// <summary>
     /// Instructs each OverlayController to pause when it reaches the specified target frame.
     /// This method does not directly pause video playback.
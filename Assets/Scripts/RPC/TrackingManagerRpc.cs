@@ -30,4 +30,24 @@ public class TrackingManagerRpc : JsonRpcService
         UpdateResult _updateResult = updateResult.ToObject<UpdateResult>();
         trackingManager.OnReceive(_updateResult);
     }
+
+    [JsonRpcMethod]
+    public void OnReceiveStats(JObject statsResult)
+    {
+        StatsResult _statsResult = statsResult.ToObject<StatsResult>();
+        trackingManager.OnReceiveStats(_statsResult);
+    }
+
+    [JsonRpcMethod]
+    public TrackQuery GetQuery()
+    {
+        return trackingManager.GetQuery();
+    }
+
+    [JsonRpcMethod]
+    public void OnQueryResult(JObject queryResult)
+    {
+        TrackQueryResult _queryResult = queryResult.ToObject<TrackQueryResult>();
+        trackingManager.OnQueryResult(_queryResult);
+    }
 }
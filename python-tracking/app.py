@@ -1,12 +1,13 @@
 from tracker import update
 
 
-def update_data(data):
+def update_data(data, params=None):
     """Processes the tracking update using the provided JSON-like dictionary.
 
     Parameters:
         data (dict): {"frame_id":7200, "coords": [{"id":5, "c":[x,y], "src":0},...]}
         Dictionary expected to contain 'coord_id' and 'frame_id'.
+        params (dict): Optional overrides for tracker.TRACKER_PARAMS.
 
     Returns:
         {"lost_frame_id": lost_frame_id, "tracks": tracks, "lost_ids": lost_ids}
@@ -26,7 +27,7 @@ def update_data(data):
     try:
         # Call the update function from  It is assumed to return:
         # (lost_frame_id, lost_ids, tracking_response)
-        lost_frame_id, lost_ids, tracking_response = update(frame_id, coord_id)
+        lost_frame_id, lost_ids, tracking_response = update(frame_id, coord_id, params)
     except Exception as e:
         return {"error": str(e)}
 
@@ -0,0 +1,85 @@
+import numpy as np
+
+SEAM_X = 347  # Right-camera x offset in the tracker plane
+FUSION_BAND = 25.0  # Half-width of the overlap band around the seam
+FUSION_DISTANCE = 8.0  # Max left/right distance for one player seen twice
+
+
+def fuse_detections(input_data, band=FUSION_BAND, max_distance=FUSION_DISTANCE):
+    """Merge players seen by both cameras in the overlap band into one detection.
+
+    Left and right detections within `band` of the seam are paired across
+    the whole match at once. A pair is merged when the two detections are
+    each other's nearest counterpart in that frame and closer than
+    `max_distance`. The merged detection keeps the source, team_index and
+    confidence of the more confident one. Its center is the
+    confidence-weighted mean of the pair.
+
+    :param input_data: List of frame detection dictionaries.
+    :param band: Half-width of the overlap band in tracker plane units.
+    :param max_distance: Max distance between the two views of a player.
+    :return: A new list of frames; the input frames are not modified.
+    """
+    objects = [
+        (position, obj)
+        for position, frame in enumerate(input_data)
+        for obj in frame["objects"]
+    ]
+    if not objects:
+        return input_data
+    frames = np.array([position for position, _ in objects], dtype=np.int64)
+    right = np.array([obj["source"] == "right" for _, obj in objects])
+    points = np.array([obj["transformed_center"] for _, obj in objects], dtype=np.float64)
+    points[right, 0] += SEAM_X
+    confidence = np.array([obj["confidence"] for _, obj in objects], dtype=np.float64)
+
+    in_band = np.abs(points[:, 0] - SEAM_X) <= band
+    left_rows = np.flatnonzero(in_band & ~right)
+    right_rows = np.flatnonzero(in_band & right)
+
+    # Every (left, right) pair of band detections sharing a frame.
+    starts = np.searchsorted(frames[right_rows], frames[left_rows], side="left")
+    ends = np.searchsorted(frames[right_rows], frames[left_rows], side="right")
+    counts = ends - starts
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pair_left = np.repeat(left_rows, counts)
+    pair_right = right_rows[np.repeat(starts, counts) + offsets]
+
+    distance = np.linalg.norm(points[pair_left] - points[pair_right], axis=1)
+    close = distance <= max_distance
+    pair_left, pair_right, distance = pair_left[close], pair_right[close], distance[close]
+
+    # Keep mutual nearest neighbours: the closest pair for both of its members.
+    order = np.argsort(distance, kind="stable")
+    pair_left, pair_right = pair_left[order], pair_right[order]
+    first_left = np.zeros(len(order), dtype=bool)
+    first_left[np.unique(pair_left, return_index=True)[1]] = True
+    first_right = np.zeros(len(order), dtype=bool)
+    first_right[np.unique(pair_right, return_index=True)[1]] = True
+    mutual = first_left & first_right
+    pair_left, pair_right = pair_left[mutual], pair_right[mutual]
+
+    left_wins = confidence[pair_left] >= confidence[pair_right]
+    keep = np.where(left_wins, pair_left, pair_right)
+    drop = np.where(left_wins, pair_right, pair_left)
+    weights = np.column_stack([confidence[pair_left], confidence[pair_right]])
+    weights[weights.sum(axis=1) == 0] = 1.0  # Two zero-confidence views count equally
+    weights /= weights.sum(axis=1, keepdims=True)
+    merged = (
+        points[pair_left] * weights[:, :1] + points[pair_right] * weights[:, 1:]
+    )
+    merged[right[keep], 0] -= SEAM_X
+
+    replaced = {}
+    for row, center in zip(keep.tolist(), merged.tolist()):
+        replaced[row] = {**objects[row][1], "transformed_center": center}
+    dropped = np.zeros(len(objects), dtype=bool)
+    dropped[drop] = True
+
+    fused = [{**frame, "objects": []} for frame in input_data]
+    for row, (position, obj) in enumerate(objects):
+        if not dropped[row]:
+            fused[position]["objects"].append(replaced.get(row, obj))
+
+    print(f"Fused {len(drop)} duplicate detections in the camera overlap band")
+    return fused
@@ -0,0 +1,231 @@
+import json
+import sys
+
+import numpy as np
+
+from transform_utility import transform_points
+
+MATCH_DISTANCE = 10.0  # Max distance (tracker plane units) for a hit
+
+
+def load_tracks(path):
+    """Load formatted tracking data from a JSON file.
+
+    Accepts either a bare list of frames or a full update result with a
+    "tracks" key, as written by test.py.
+
+    :param path: Path to the JSON file.
+    :return: A list of frames, each {"fr": ..., "obj": [{"id", "cls_id",
+        "c", "src"}, ...]}.
+    """
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data["tracks"]
+    return data
+
+
+def flatten_tracks(tracks):
+    """Flatten formatted tracking data into frame-sorted NumPy arrays.
+
+    Centers are forward-transformed back into the tracker plane, so left
+    and right camera points share one coordinate system and distances
+    mean the same thing on both sides of the pitch.
+
+    :param tracks: A list of formatted frames.
+    :return: A tuple (frames, ids, points, classes) of shapes (N,), (N,),
+        (N, 2) and (N,), sorted by frame.
+    """
+    counts = [len(frame["obj"]) for frame in tracks]
+    total = sum(counts)
+    objects = [obj for frame in tracks for obj in frame["obj"]]
+
+    frames = np.repeat(
+        np.array([frame["fr"] for frame in tracks], dtype=np.int64), counts
+    )
+    ids = np.fromiter((obj["id"] for obj in objects), dtype=np.int64, count=total)
+    srcs = np.fromiter((obj["src"] for obj in objects), dtype=np.int64, count=total)
+    classes = np.fromiter(
+        (obj["cls_id"] for obj in objects), dtype=np.int64, count=total
+    )
+    coords = np.array([obj["c"] for obj in objects], dtype=np.float64)
+    points = transform_points(coords, srcs)
+
+    order = np.argsort(frames, kind="stable")
+    return frames[order], ids[order], points[order], classes[order]
+
+
+def evaluate(tracks, ground_truth, max_distance=MATCH_DISTANCE):
+    """Score tracking output against annotated ground truth.
+
+    Only frames present in `tracks` are scored, so a chunk that stopped
+    early at a lost track is not penalised for frames it never produced.
+    Matching follows CLEAR MOT: in every frame, correspondences from the
+    previous frame are kept while they stay within `max_distance`, and the
+    rest are assigned with the Hungarian algorithm on the frame's distance
+    matrix. Candidate pairs are built for the whole match at once, and
+    only points with several candidates go through the Hungarian
+    algorithm.
+
+    :param tracks: Formatted tracking output (list of {"fr", "obj"}).
+    :param ground_truth: Ground truth in the same format.
+    :param max_distance: Max tracker-plane distance for a match.
+    :return: A dict with MOTA, IDF1, ID switches, fragmentations, match
+        counts and per ground-truth ID coverage.
+    """
+    from scipy.optimize import linear_sum_assignment  # Only scoring needs scipy
+
+    hyp_frames, hyp_ids, hyp_points, _ = flatten_tracks(tracks)
+    gt_frames, gt_ids, gt_points, _ = flatten_tracks(ground_truth)
+
+    frames = np.unique(hyp_frames)
+    keep = np.isin(gt_frames, frames)
+    gt_frames, gt_ids, gt_points = gt_frames[keep], gt_ids[keep], gt_points[keep]
+
+    gt_labels, gt_idx = np.unique(gt_ids, return_inverse=True)
+    hyp_labels, hyp_idx = np.unique(hyp_ids, return_inverse=True)
+    gt_pos = np.searchsorted(frames, gt_frames)
+    hyp_pos = np.searchsorted(frames, hyp_frames)
+    gt_start = np.searchsorted(gt_frames, frames, side="left")
+    gt_end = np.searchsorted(gt_frames, frames, side="right")
+    hyp_start = np.searchsorted(hyp_frames, frames, side="left")
+    hyp_end = np.searchsorted(hyp_frames, frames, side="right")
+
+    last_match = np.full(len(gt_labels), -1, dtype=np.int64)
+    last_pos = np.full(len(gt_labels), -1, dtype=np.int64)
+    present = np.zeros((len(frames), len(gt_labels)), dtype=bool)
+    present[gt_pos, gt_idx] = True
+    id_overlap = np.zeros((len(gt_labels), len(hyp_labels)), dtype=np.int64)
+    # (frame positions, gt labels, hyp labels) of every match
+    matched = [(np.empty(0, dtype=np.int64),) * 3]
+
+    # Every (gt, hyp) pair of one frame within max_distance in x, found for
+    # the whole match at once by binary search on hypotheses sorted by
+    # (frame, x). The key keeps every x window inside its own frame.
+    x = np.concatenate([gt_points[:, 0], hyp_points[:, 0], [0.0]])
+    x_low = x.min()
+    span = x.max() - x_low + 2 * max_distance + 2
+    hyp_key = hyp_pos * span + (hyp_points[:, 0] - x_low)
+    by_key = np.argsort(hyp_key, kind="stable")
+    hyp_key = hyp_key[by_key]
+    gt_key = gt_pos * span + (gt_points[:, 0] - x_low)
+    starts = np.searchsorted(hyp_key, gt_key - max_distance - 1, side="left")
+    ends = np.searchsorted(hyp_key, gt_key + max_distance + 1, side="right")
+    counts = ends - starts
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pair_gt = np.repeat(np.arange(len(gt_pos)), counts)
+    pair_hyp = by_key[np.repeat(starts, counts) + offsets]
+    distance = np.linalg.norm(gt_points[pair_gt] - hyp_points[pair_hyp], axis=1)
+    valid = distance <= max_distance
+    pair_gt, pair_hyp, distance = pair_gt[valid], pair_hyp[valid], distance[valid]
+    np.add.at(id_overlap, (gt_idx[pair_gt], hyp_idx[pair_hyp]), 1)
+
+    # A pair is a match outright when neither of its points has another
+    # candidate. The rest form small groups that need the Hungarian
+    # algorithm, frame by frame.
+    many_gt = np.bincount(pair_gt, minlength=len(gt_pos)) > 1
+    many_hyp = np.bincount(pair_hyp, minlength=len(hyp_pos)) > 1
+    hard = many_gt[pair_gt] | many_hyp[pair_hyp]
+    easy_pos = gt_pos[pair_gt[~hard]]
+    easy_g, easy_h = gt_idx[pair_gt[~hard]], hyp_idx[pair_hyp[~hard]]
+    matched.append((easy_pos, easy_g, easy_h))
+
+    # Easy matches by (gt label, frame), behind a sentinel, to look up
+    # the last match of a gt label before an ambiguous frame.
+    order = np.lexsort((easy_pos, easy_g))
+    easy_key = np.concatenate([[-1], (easy_g * len(frames) + easy_pos)[order]])
+    easy_pos_by_g = np.concatenate([[-1], easy_pos[order]])
+    easy_g_by_g = np.concatenate([[-1], easy_g[order]])
+    easy_h_by_g = np.concatenate([[-1], easy_h[order]])
+
+    hard_gt, hard_hyp, hard_distance = pair_gt[hard], pair_hyp[hard], distance[hard]
+    hard_pos = gt_pos[hard_gt]
+    hard_rows = hard_gt - gt_start[hard_pos]
+    hard_cols = hard_hyp - hyp_start[hard_pos]
+    hard_g, hard_h = gt_idx[hard_gt], hyp_idx[hard_hyp]
+    k = np.searchsorted(easy_key, hard_g * len(frames) + hard_pos) - 1
+    easy_before = easy_g_by_g[k] == hard_g
+    easy_prev_pos = np.where(easy_before, easy_pos_by_g[k], -1)
+    easy_prev_h = easy_h_by_g[k]
+
+    hard_frames, bounds = np.unique(hard_pos, return_index=True)
+    for f, lo, hi in zip(
+        hard_frames.tolist(), bounds.tolist(), np.append(bounds[1:], len(hard_pos)).tolist()
+    ):
+        g, h = hard_g[lo:hi], hard_h[lo:hi]
+        previous = np.where(
+            easy_prev_pos[lo:hi] > last_pos[g], easy_prev_h[lo:hi], last_match[g]
+        )
+
+        # Correspondences kept from the previous match cost -1.
+        cost = np.full(
+            (gt_end[f] - gt_start[f], hyp_end[f] - hyp_start[f]), max_distance * 1e3
+        )
+        cost[hard_rows[lo:hi], hard_cols[lo:hi]] = np.where(
+            previous == h, -1.0, hard_distance[lo:hi]
+        )
+        rows, cols = linear_sum_assignment(cost)
+        ok = cost[rows, cols] <= max_distance
+        g = gt_idx[gt_start[f] + rows[ok]]
+        h = hyp_idx[hyp_start[f] + cols[ok]]
+        last_match[g] = h
+        last_pos[g] = f
+        matched.append((np.full(len(g), f), g, h))
+
+    match_pos, match_g, match_h = (np.concatenate(column) for column in zip(*matched))
+    matches = len(match_g)
+    tracked = np.zeros((len(frames), len(gt_labels)), dtype=bool)
+    tracked[match_pos, match_g] = True
+
+    # An ID switch is a gt id matched to another hyp id than the last time.
+    order = np.lexsort((match_pos, match_g))
+    match_g, match_h = match_g[order], match_h[order]
+    id_switches = int(
+        np.count_nonzero((np.diff(match_g) == 0) & (np.diff(match_h) != 0))
+    )
+
+    num_gt = len(gt_idx)
+    num_hyp = len(hyp_idx)
+    false_negatives = num_gt - matches
+    false_positives = num_hyp - matches
+
+    rows, cols = linear_sum_assignment(-id_overlap)
+    idtp = int(id_overlap[rows, cols].sum())
+
+    fragmentations = 0
+    for column in range(len(gt_labels)):
+        states = tracked[present[:, column], column].astype(np.int8)
+        if not states.any():
+            continue
+        # A fragmentation is every resumption of tracking after a gap.
+        states = states[np.argmax(states) :]
+        fragmentations += int(np.count_nonzero(np.diff(states) == 1))
+
+    present_count = present.sum(axis=0)
+    coverage = tracked.sum(axis=0) / np.maximum(present_count, 1)
+
+    return {
+        "num_frames": int(len(frames)),
+        "num_gt": int(num_gt),
+        "num_hyp": int(num_hyp),
+        "matches": int(matches),
+        "false_positives": int(false_positives),
+        "false_negatives": int(false_negatives),
+        "id_switches": id_switches,
+        "fragmentations": fragmentations,
+        "mota": 1.0 - (false_negatives + false_positives + id_switches) / max(num_gt, 1),
+        "idf1": 2.0 * idtp / max(num_gt + num_hyp, 1),
+        "coverage": {
+            int(label): float(value) for label, value in zip(gt_labels, coverage)
+        },
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print(f"Usage: python {sys.argv[0]} <tracks_json> <ground_truth_json> [max_distance]")
+        sys.exit(1)
+
+    max_distance = float(sys.argv[3]) if len(sys.argv) == 4 else MATCH_DISTANCE
+    result = evaluate(load_tracks(sys.argv[1]), load_tracks(sys.argv[2]), max_distance)
+    print(json.dumps(result, indent=4))
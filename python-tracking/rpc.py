@@ -1,16 +1,103 @@
 import argparse
+import io
 import time
-from peaceful_pie.unity_comms import UnityComms
-from app import update_data 
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager, redirect_stdout
+
+POLL_INTERVAL = 0.005  # Seconds between polls of Unity for readiness and queries
+
+
+@contextmanager
+def timed(timings, step):
+    began = time.perf_counter()
+    yield
+    timings[step] = time.perf_counter() - began
+
+
+def warm_up(timings) -> None:
+    """Run every step of the request loop once so the first request is fast.
+
+    Imports supervision, the stats and the track store, parses the
+    detections and loads the homographies. A throwaway tracker update over
+    the first two frames is then stored, saved and turned into stats.
+
+    :param timings: Dict {step: seconds} the step times are added to.
+    """
+    with timed(timings, "import supervision"):
+        import supervision  # noqa: F401
+    with timed(timings, "import stats, store"):
+        from stats import compute_sample_stats
+        from track_store import TrackStore, handle_query  # noqa: F401
+    from tracker import load_detections, perform_tracking_from_json
+    from transform_utility import load_homography, load_inverse_homography
+
+    with timed(timings, "parse detections"):
+        input_data, frame_indices = load_detections()
+    with timed(timings, "load homographies"):
+        for src in (0, 1):
+            load_homography(src)
+            load_inverse_homography(src)
+    if not input_data:
+        print("No detections to warm up on; skipping the dummy update.")
+        return
+
+    with timed(timings, "dummy update"):
+        with redirect_stdout(io.StringIO()):
+            _, _, tracks = perform_tracking_from_json(
+                input_data[:2], frame_indices[0], {}
+            )
+    with timed(timings, "dummy store, stats"):
+        scratch = TrackStore()
+        scratch.append(tracks)
+        scratch.save(io.BytesIO())
+        compute_sample_stats(*scratch.samples())
+
+
+def answer_queries(unity_comms, store) -> None:
+    from track_store import handle_query
+
+    # Drain Unity's pending track store queries.
+    query = unity_comms.GetQuery()
+    while query:
+        unity_comms.OnQueryResult(queryResult=handle_query(store, query))
+        query = unity_comms.GetQuery()
 
 def run(args: argparse.Namespace) -> None:
+    # Only what the request loop needs is imported up front; supervision is
+    # imported by the first update, or by the warm-up in daemon mode.
+    timings = {}
+    started = time.perf_counter()
+    with timed(timings, "import peaceful_pie"):
+        from peaceful_pie.unity_comms import UnityComms
+    with timed(timings, "import tracker"):
+        from app import update_data
+
+    tracker_params = {"adaptive_stride": args.adaptive_stride}
+
+    if args.daemon:
+        warm_up(timings)
+
+    with timed(timings, "load track store"):
+        from track_store import TrackStore
+        store = TrackStore(args.store)
+
+    if args.daemon:
+        print("Startup time breakdown:")
+        for step, seconds in timings.items():
+            print(f"  {step:<24}{seconds:8.3f} s")
+        print(f"  {'total':<24}{time.perf_counter() - started:8.3f} s")
+        print("Tracking daemon ready.")
+
     unity_comms = UnityComms(port=args.port)
+    # Tracking runs on a worker thread so queries are answered meanwhile.
+    tracking = ThreadPoolExecutor(max_workers=1)
     
     while True:
         # Wait until Unity reports that it is ready.
+        print("Waiting for Unity to be ready...")
         while not unity_comms.IsReady():
-            print("Waiting for Unity to be ready...")
-            time.sleep(0.5)
+            answer_queries(unity_comms, store)
+            time.sleep(POLL_INTERVAL)
         
         print("Unity is ready. Requesting track data...")
         # Get the TrackRequest from Unity.
@@ -20,7 +107,10 @@ def run(args: argparse.Namespace) -> None:
         
         # Process the track request using the update function.
         # The update function is expected to return a dict that matches the UpdateResult struct.
-        update_result = update_data(track_request)
+        pending = tracking.submit(update_data, track_request, tracker_params)
+        while not wait([pending], timeout=POLL_INTERVAL).done:
+            answer_queries(unity_comms, store)
+        update_result = pending.result()
         print("UpdateResult from processing:")
         #print(update_result)
         
@@ -28,8 +118,29 @@ def run(args: argparse.Namespace) -> None:
         unity_comms.OnReceive(updateResult=update_result)
         print("UpdateResult sent back to Unity.")
 
+        if update_result.get("tracks"):
+            store.append(update_result["tracks"])
+            store.save()
+
+        # Recompute player stats over everything in the store and send them too.
+        from stats import compute_sample_stats
+
+        if len(store):
+            # Stats are a side channel; never let them break the tracking loop.
+            try:
+                stats_result = compute_sample_stats(*store.samples())
+                unity_comms.OnReceiveStats(statsResult=stats_result)
+                print("StatsResult sent back to Unity.")
+            except Exception as e:
+                print(f"Failed to send player stats: {e}")
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--store', default='track_store.npz')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Warm up the tracker before serving and report startup times')
+    parser.add_argument('--adaptive-stride', type=int, default=1,
+                        help='Track every Nth frame through calm stretches (1 = every frame)')
     args = parser.parse_args()
     run(args)
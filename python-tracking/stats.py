@@ -0,0 +1,202 @@
+import json
+import sys
+
+import numpy as np
+
+from metrics import flatten_tracks, load_tracks
+from tracker import TRACKER_PARAMS
+
+# The tracker plane puts the left half of the pitch at x in [0, 347] and the
+# right half at [347, 694], so its length maps onto a 105 m x 68 m pitch.
+PITCH_LENGTH_M = 105.0
+PITCH_WIDTH_M = 68.0
+PITCH_LENGTH_UNITS = 2 * 347
+METRES_PER_UNIT = PITCH_LENGTH_M / PITCH_LENGTH_UNITS
+
+MAX_SPEED = 12.0  # m/s; faster steps are id jumps or re-acquisitions
+SPRINT_SPEED = 7.0  # m/s
+SPRINT_MIN_DURATION = 1.0  # s
+ACCELERATION_THRESHOLD = 2.0  # m/s^2 for counting accelerations/decelerations
+SPEED_ZONES = [0.0, 2.0, 4.0, 5.5, SPRINT_SPEED]  # m/s; walk, jog, run, HSR, sprint
+HEATMAP_BINS = (8, 12)  # rows (pitch width) x columns (pitch length)
+SMOOTHING_WINDOW = 15  # samples in the centred moving average before differencing
+
+
+def moving_average(values, player_idx, window=SMOOTHING_WINDOW):
+    """Centred moving average along axis 0 that never mixes two players.
+
+    :param values: (N,) or (N, 2) samples sorted by (player, frame).
+    :param player_idx: (N,) sorted player index of every sample.
+    :param window: Number of samples averaged. It shrinks symmetrically at
+        trajectory ends, so the window stays centred and a constant
+        velocity is left unchanged.
+    :return: The smoothed values, same shape as `values`.
+    """
+    index = np.arange(len(values))
+    segment_start = np.searchsorted(player_idx, player_idx, side="left")
+    segment_end = np.searchsorted(player_idx, player_idx, side="right")
+    half = np.minimum(
+        window // 2, np.minimum(index - segment_start, segment_end - 1 - index)
+    )
+    lo = index - half
+    hi = index + half + 1
+    cumulative = np.concatenate(
+        [np.zeros((1,) + values.shape[1:]), np.cumsum(values, axis=0)]
+    )
+    count = (hi - lo).reshape((-1,) + (1,) * (values.ndim - 1))
+    return (cumulative[hi] - cumulative[lo]) / count
+
+
+def compute_player_stats(tracks, fps=TRACKER_PARAMS["frame_rate"]):
+    """Compute per-player and per-team physical stats from tracking output.
+
+    Every track point is mapped to the tracker plane with the camera
+    homographies and scaled to metres. All quantities are computed on whole-
+    match arrays sorted by (id, frame). Motion is measured on smoothed
+    trajectories so detection jitter does not inflate it. Steps between
+    different ids or faster than MAX_SPEED do not count towards distance.
+
+    :param tracks: Formatted tracking output (list of {"fr", "obj"}).
+    :param fps: Video frame rate.
+    :return: A JSON-ready dict with "players", "teams" and "heatmap_shape".
+        Heatmaps are row-major seconds spent per pitch cell.
+    """
+    return compute_sample_stats(*flatten_tracks(tracks), fps)
+
+
+def compute_sample_stats(frames, ids, points, classes, fps=TRACKER_PARAMS["frame_rate"]):
+    """compute_player_stats on flat track samples, as kept by a TrackStore.
+
+    :param frames, ids, classes: (N,) arrays, one row per track point.
+    :param points: (N, 2) tracker plane positions.
+    :param fps: Video frame rate.
+    :return: The same dict as compute_player_stats.
+    """
+    rows, cols = HEATMAP_BINS
+    if len(frames) == 0:
+        return {"players": [], "teams": [], "heatmap_shape": [rows, cols]}
+    order = np.lexsort((frames, ids))
+    frames, ids, points, classes = (
+        frames[order],
+        ids[order],
+        points[order] * METRES_PER_UNIT,
+        classes[order],
+    )
+    player_ids, player_idx = np.unique(ids, return_inverse=True)
+    players = len(player_ids)
+
+    # Steps between consecutive samples of the same player. Positions are
+    # smoothed per run of consecutive frames, so a gap in a track does not
+    # bend the trajectory around it.
+    breaks = (np.diff(ids) != 0) | (np.diff(frames) != 1)
+    smoothed = moving_average(points, np.cumsum(np.concatenate([[0], breaks])))
+    dt = np.diff(frames) / fps
+    same = (np.diff(ids) == 0) & (dt > 0)
+    step = np.linalg.norm(np.diff(smoothed, axis=0), axis=1)
+    speed = np.divide(step, dt, out=np.zeros_like(step), where=same)
+    valid = same & (speed <= MAX_SPEED)
+    speed[~valid] = 0.0
+    step_player = player_idx[1:]
+
+    distance = np.bincount(step_player[valid], weights=step[valid], minlength=players)
+    moving_time = np.bincount(step_player[valid], weights=dt[valid], minlength=players)
+    max_speed = np.zeros(players)
+    np.maximum.at(max_speed, step_player[valid], speed[valid])
+
+    zones = np.digitize(speed, SPEED_ZONES) - 1
+    zone_distance = np.bincount(
+        step_player[valid] * len(SPEED_ZONES) + zones[valid],
+        weights=step[valid],
+        minlength=players * len(SPEED_ZONES),
+    ).reshape(players, len(SPEED_ZONES))
+
+    # Acceleration between two adjacent valid steps of the same player, on a
+    # smoothed speed profile since differencing twice amplifies jitter. Speed
+    # is only smoothed within runs of valid steps, so the zeroed steps at
+    # player boundaries and gaps do not drag it down.
+    both = valid[:-1] & valid[1:]
+    run_change = (step_player[1:] != step_player[:-1]) | (valid[1:] != valid[:-1])
+    valid_run = np.cumsum(np.concatenate([[0], run_change]))
+    smoothed_speed = moving_average(speed, valid_run)
+    acceleration = np.diff(smoothed_speed) / np.maximum((dt[:-1] + dt[1:]) / 2, 1e-9)
+    acceleration_player = step_player[1:][both]
+    acceleration = acceleration[both]
+    max_acceleration = np.zeros(players)
+    max_deceleration = np.zeros(players)
+    np.maximum.at(max_acceleration, acceleration_player, acceleration)
+    np.maximum.at(max_deceleration, acceleration_player, -acceleration)
+    accelerations = np.bincount(
+        acceleration_player[acceleration > ACCELERATION_THRESHOLD], minlength=players
+    )
+    decelerations = np.bincount(
+        acceleration_player[acceleration < -ACCELERATION_THRESHOLD], minlength=players
+    )
+
+    # Sprints are runs of consecutive sprint-speed steps lasting long enough.
+    sprinting = valid & (speed >= SPRINT_SPEED)
+    run_start = sprinting & ~np.concatenate([[False], sprinting[:-1]])
+    run_label = np.cumsum(run_start) - 1
+    run_duration = np.bincount(run_label[sprinting], weights=dt[sprinting])
+    run_player = step_player[run_start]
+    sprints = np.bincount(
+        run_player[run_duration >= SPRINT_MIN_DURATION], minlength=players
+    )
+
+    # Occupancy: seconds per pitch cell, one sample per frame.
+    col = np.clip((points[:, 0] / PITCH_LENGTH_M * cols).astype(np.int64), 0, cols - 1)
+    row = np.clip((points[:, 1] / PITCH_WIDTH_M * rows).astype(np.int64), 0, rows - 1)
+    heatmaps = np.bincount(
+        player_idx * rows * cols + row * cols + col,
+        minlength=players * rows * cols,
+    ).reshape(players, rows * cols) / fps
+
+    # A player's team is the class it was tracked with most often.
+    team_labels, team_idx = np.unique(classes, return_inverse=True)
+    player_team = np.bincount(
+        player_idx * len(team_labels) + team_idx,
+        minlength=players * len(team_labels),
+    ).reshape(players, len(team_labels)).argmax(axis=1)
+
+    player_stats = []
+    for p in range(players):
+        player_stats.append(
+            {
+                "id": int(player_ids[p]),
+                "cls_id": int(team_labels[player_team[p]]),
+                "distance": round(float(distance[p]), 1),
+                "max_speed": round(float(max_speed[p]), 2),
+                "mean_speed": round(float(distance[p] / max(moving_time[p], 1e-9)), 2),
+                "max_acceleration": round(float(max_acceleration[p]), 2),
+                "max_deceleration": round(float(max_deceleration[p]), 2),
+                "accelerations": int(accelerations[p]),
+                "decelerations": int(decelerations[p]),
+                "sprints": int(sprints[p]),
+                "zone_distance": [round(float(d), 1) for d in zone_distance[p]],
+                "heatmap": [round(float(s), 2) for s in heatmaps[p]],
+            }
+        )
+
+    team_stats = []
+    for t, label in enumerate(team_labels):
+        members = player_team == t
+        team_stats.append(
+            {
+                "cls_id": int(label),
+                "distance": round(float(distance[members].sum()), 1),
+                "sprints": int(sprints[members].sum()),
+                "zone_distance": [
+                    round(float(d), 1) for d in zone_distance[members].sum(axis=0)
+                ],
+                "heatmap": [round(float(s), 2) for s in heatmaps[members].sum(axis=0)],
+            }
+        )
+
+    return {"players": player_stats, "teams": team_stats, "heatmap_shape": [rows, cols]}
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(f"Usage: python {sys.argv[0]} <tracks_json>")
+        sys.exit(1)
+
+    print(json.dumps(compute_player_stats(load_tracks(sys.argv[1])), indent=4))
@@ -0,0 +1,283 @@
+import argparse
+import contextlib
+import csv
+import hashlib
+import io
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from metrics import evaluate, flatten_tracks, load_tracks
+from tracker import (
+    CHUNK_LENGTH,
+    TRACKER_PARAMS,
+    load_detections,
+    perform_tracking_from_json,
+)
+
+# Read-only data shared with worker processes, set by _init_worker.
+_chunks = {}
+_ground_truth = {}
+
+
+def load_search_space(path):
+    """Load a sweep search space from a JSON file.
+
+    Every key must be a TRACKER_PARAMS name. A list value is a set of
+    discrete choices; a {"min": a, "max": b} value is a uniform range that
+    is only valid for random search (ints stay ints if both bounds are).
+
+    :param path: Path to the JSON search space.
+    :return: The search space dict.
+    """
+    with open(path) as f:
+        space = json.load(f)
+    unknown = set(space) - set(TRACKER_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown tracker parameters: {sorted(unknown)}")
+    return space
+
+
+def grid_configs(space):
+    """Expand a search space of discrete choices into every combination."""
+    for name, values in space.items():
+        if not isinstance(values, list):
+            raise ValueError(f"Grid search needs a list of values for {name}")
+    names = list(space)
+    for values in itertools.product(*(space[name] for name in names)):
+        yield dict(zip(names, values))
+
+
+def random_configs(space, samples, seed):
+    """Draw `samples` configurations uniformly from a search space."""
+    rng = random.Random(seed)
+    for _ in range(samples):
+        config = {}
+        for name, values in space.items():
+            if isinstance(values, list):
+                config[name] = rng.choice(values)
+            elif isinstance(values["min"], int) and isinstance(values["max"], int):
+                config[name] = rng.randint(values["min"], values["max"])
+            else:
+                config[name] = rng.uniform(values["min"], values["max"])
+        yield config
+
+
+def config_key(config):
+    """Stable string identifying a configuration in the results file."""
+    return json.dumps(config, sort_keys=True)
+
+
+def data_fingerprint(detections_path, starts, ground_truth_path):
+    """Hash of the inputs a sweep is scored on.
+
+    Results are only reused on resume when they were computed on the same
+    detections, chunk starts and ground truth.
+    """
+    digest = hashlib.sha1()
+    for path in (detections_path, ground_truth_path):
+        if path:
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+        digest.update(b"\0")
+    digest.update(json.dumps(sorted(starts)).encode())
+    return digest.hexdigest()
+
+
+def split_chunks(input_data, starts):
+    """Cut the detection data into CHUNK_LENGTH-frame chunks.
+
+    :param input_data: The full list of frame detection dictionaries.
+    :param starts: Start frames of the chunks, or None for consecutive
+        chunks covering the whole match.
+    :return: A dict {start_frame: list of frames}.
+    """
+    frame_indices = [frame["frame_index"] for frame in input_data]
+    if not starts:
+        starts = range(min(frame_indices), max(frame_indices) + 1, CHUNK_LENGTH)
+    chunks = {}
+    for start in starts:
+        chunks[start] = [
+            frame
+            for frame in input_data
+            if start <= frame["frame_index"] < start + CHUNK_LENGTH
+        ]
+    return {start: frames for start, frames in chunks.items() if frames}
+
+
+def count_id_jumps(tracks, max_distance):
+    """Estimate ID switches without ground truth.
+
+    Counts the times an id moves further than `max_distance` between two
+    consecutive frames, which is what an id hopping to another player
+    looks like in the output.
+    """
+    frames, ids, points, _ = flatten_tracks(tracks)
+    order = np.lexsort((frames, ids))
+    frames, ids, points = frames[order], ids[order], points[order]
+    step = np.linalg.norm(np.diff(points, axis=0), axis=1)
+    consecutive = (np.diff(ids) == 0) & (np.diff(frames) == 1)
+    return int(np.count_nonzero(consecutive & (step > max_distance)))
+
+
+def _init_worker(chunks, ground_truth):
+    global _chunks, _ground_truth
+    _chunks = chunks
+    _ground_truth = ground_truth
+
+    # Pay the one-off costs (the supervision import, homography loads)
+    # outside the timed runs, so a worker's first configuration is not
+    # ranked as slower than the rest.
+    if chunks:
+        start = next(iter(chunks))
+        with contextlib.redirect_stdout(io.StringIO()):
+            perform_tracking_from_json(chunks[start][:2], start, {})
+
+
+def run_config(config):
+    """Track every chunk with one configuration and score it.
+
+    Runs inside a worker process, reading the chunks set by _init_worker.
+    The tracker returns at the first lost track it reports, so a chunk has
+    at most one loss; stopped chunks counts the chunks that ended early.
+    """
+    params = {**TRACKER_PARAMS, **config}
+    frames = 0
+    seconds = 0.0
+    stopped_chunks = 0
+    id_switches = 0
+    for start, chunk in _chunks.items():
+        began = time.perf_counter()
+        # The tracker logs every id assignment; keep worker output readable.
+        with contextlib.redirect_stdout(io.StringIO()):
+            _, lost_ids, tracks = perform_tracking_from_json(chunk, start, {}, params)
+        seconds += time.perf_counter() - began
+        frames += len(tracks)
+        stopped_chunks += 1 if lost_ids else 0
+        if start in _ground_truth:
+            id_switches += evaluate(tracks, _ground_truth[start])["id_switches"]
+        else:
+            id_switches += count_id_jumps(tracks, params["reid_distance"])
+
+    frames = max(frames, 1)
+    return {
+        "key": config_key(config),
+        "config": config,
+        "frames": frames,
+        "fps": frames / max(seconds, 1e-9),
+        "id_switches_per_1k": 1000.0 * id_switches / frames,
+        "stopped_chunks_per_1k": 1000.0 * stopped_chunks / frames,
+    }
+
+
+def rank_results(results):
+    """Order results by error rate, then by throughput."""
+    return sorted(
+        results,
+        key=lambda r: (r["id_switches_per_1k"] + r["stopped_chunks_per_1k"], -r["fps"]),
+    )
+
+
+def write_table(results, path):
+    """Write the ranked results as a CSV table, one column per parameter."""
+    names = sorted({name for r in results for name in r["config"]})
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "rank",
+                *names,
+                "fps",
+                "id_switches_per_1k",
+                "stopped_chunks_per_1k",
+                "frames",
+            ]
+        )
+        for rank, r in enumerate(results, start=1):
+            writer.writerow(
+                [
+                    rank,
+                    *(r["config"].get(name, "") for name in names),
+                    round(r["fps"], 1),
+                    round(r["id_switches_per_1k"], 3),
+                    round(r["stopped_chunks_per_1k"], 3),
+                    r["frames"],
+                ]
+            )
+
+
+def run(args: argparse.Namespace) -> None:
+    space = load_search_space(args.space)
+    if args.samples:
+        configs = list(random_configs(space, args.samples, args.seed))
+    else:
+        configs = list(grid_configs(space))
+
+    input_data, _ = load_detections(args.detections)
+    chunks = split_chunks(input_data, args.starts)
+    ground_truth = {}
+    if args.ground_truth:
+        gt_frames = load_tracks(args.ground_truth)
+        for start in chunks:
+            ground_truth[start] = [
+                frame for frame in gt_frames if start <= frame["fr"] < start + CHUNK_LENGTH
+            ]
+    fingerprint = data_fingerprint(args.detections, chunks, args.ground_truth)
+
+    # Resume: every finished configuration is one line in the results file.
+    # Rows scored on other detections, chunks or ground truth are ignored.
+    done = {}
+    if os.path.exists(args.results):
+        with open(args.results) as f:
+            for line in f:
+                if line.strip():
+                    result = json.loads(line)
+                    if result.get("data") == fingerprint:
+                        done[result["key"]] = result
+    keys = {config_key(c) for c in configs}
+    pending = [c for c in configs if config_key(c) not in done]
+    print(f"{len(configs)} configurations, {len(pending)} left to run.")
+
+    with open(args.results, "a") as results_file, ProcessPoolExecutor(
+        max_workers=args.workers,
+        initializer=_init_worker,
+        initargs=(chunks, ground_truth),
+    ) as pool:
+        futures = [pool.submit(run_config, config) for config in pending]
+        for future in as_completed(futures):
+            result = {**future.result(), "data": fingerprint}
+            done[result["key"]] = result
+            results_file.write(json.dumps(result) + "\n")
+            results_file.flush()
+            # done also holds reused rows from other search spaces.
+            finished = len(keys & done.keys())
+            print(
+                f"[{finished}/{len(keys)}] {result['fps']:.0f} fps, "
+                f"{result['id_switches_per_1k']:.2f} switches/1k, "
+                f"{result['stopped_chunks_per_1k']:.2f} stopped chunks/1k: {result['key']}"
+            )
+
+    ranked = rank_results([r for key, r in done.items() if key in keys])
+    write_table(ranked, args.table)
+    print(f"Ranked table written to {args.table}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("space", help="JSON search space over TRACKER_PARAMS")
+    parser.add_argument("--detections", default="radon.json")
+    parser.add_argument("--ground-truth", help="Formatted ground-truth tracks")
+    parser.add_argument("--starts", type=int, nargs="*", help="Chunk start frames")
+    parser.add_argument("--samples", type=int, help="Random search sample count")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--results", default="sweep_results.jsonl")
+    parser.add_argument("--table", default="sweep_results.csv")
+    args = parser.parse_args()
+    run(args)
@@ -0,0 +1,105 @@
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import tracker
+
+
+class _StubDetections:
+    def __init__(self, xyxy, confidence, class_id):
+        self.xyxy = xyxy
+        self.confidence = confidence
+        self.class_id = class_id
+
+
+class _StubByteTrack:
+    """Keeps a track while its detection stays within 3 units, like ByteTrack
+    does for a still player, and drops it as soon as the detection is gone."""
+
+    def __init__(self, **kwargs):
+        self._centers = {}
+        self._next_id = 1
+
+    def update_with_detections(self, detections):
+        centers = {}
+        tracked = []
+        for bbox, confidence, class_id in zip(
+            detections.xyxy, detections.confidence, detections.class_id
+        ):
+            center = (bbox[:2] + bbox[2:]) / 2
+            track_id = next(
+                (
+                    i
+                    for i, previous in self._centers.items()
+                    if i not in centers and np.linalg.norm(previous - center) < 3
+                ),
+                None,
+            )
+            if track_id is None:
+                track_id = self._next_id
+                self._next_id += 1
+            centers[track_id] = center
+            tracked.append((bbox, None, confidence, class_id, track_id, {}))
+        self._centers = centers
+        return tracked
+
+
+@pytest.fixture(autouse=True)
+def stub_supervision(monkeypatch):
+    stub = types.ModuleType("supervision")
+    stub.ByteTrack = _StubByteTrack
+    stub.Detections = _StubDetections
+    monkeypatch.setitem(sys.modules, "supervision", stub)
+
+
+def _frames(disappear_at, count=60, start=120):
+    """Three still players; the third one's detection is gone from
+    `disappear_at` onwards."""
+    frames = []
+    for position in range(count):
+        players = 3 if position < disappear_at else 2
+        frames.append(
+            {
+                "frame_index": start + position,
+                "objects": [
+                    {
+                        "transformed_center": [100.0 * (p + 1), 100.0],
+                        "source": "left",
+                        "confidence": 0.9,
+                        "team_index": p % 2,
+                    }
+                    for p in range(players)
+                ],
+            }
+        )
+    return frames
+
+
+def _track(frames, stride):
+    params = {"adaptive_stride": stride, "lost_report_frames": 2}
+    lost_frame_id, lost_ids, tracks = tracker.perform_tracking_from_json(
+        frames, frames[0]["frame_index"], {}, params
+    )
+    return lost_frame_id, lost_ids, len(tracks)
+
+
+@pytest.mark.parametrize("stride", [2, 3, 4])
+@pytest.mark.parametrize("disappear_at", [5, 6, 7, 8])
+def test_adaptive_loss_matches_full_rate(disappear_at, stride):
+    frames = _frames(disappear_at)
+    assert _track(frames, stride) == _track(frames, 1)
+
+
+def test_calm_frames_flags_lost_detections():
+    params = {**tracker.TRACKER_PARAMS, "adaptive_stride": 2}
+    calm = tracker.calm_frames(_frames(5, count=12), params)
+    assert len(calm) == 12
+    assert not calm[3:8].any()
+    assert calm[:3].all() and calm[8:].all()
+
+
+def test_calm_frames_short_chunk():
+    params = {**tracker.TRACKER_PARAMS, "adaptive_stride": 4}
+    assert len(tracker.calm_frames(_frames(10, count=3), params)) == 3
@@ -0,0 +1,87 @@
+import copy
+
+import pytest
+
+from fusion import SEAM_X, fuse_detections
+
+
+def _obj(plane_x, y, source, confidence, team_index):
+    """A detection at tracker-plane x; right-camera centers are stored
+    without the seam offset, as in radon.json."""
+    x = plane_x - SEAM_X if source == "right" else plane_x
+    return {
+        "transformed_center": [x, y],
+        "source": source,
+        "confidence": confidence,
+        "team_index": team_index,
+    }
+
+
+def _plane_x(obj):
+    x = obj["transformed_center"][0]
+    return x + SEAM_X if obj["source"] == "right" else x
+
+
+def test_seam_duplicate_is_merged_into_the_more_confident_view():
+    frames = [
+        {
+            "frame_index": 7200,
+            "objects": [
+                _obj(340.0, 100.0, "left", 0.6, 0),
+                _obj(343.0, 102.0, "right", 0.9, 1),
+                _obj(100.0, 50.0, "left", 0.8, 0),
+            ],
+        }
+    ]
+    original = copy.deepcopy(frames)
+    fused = fuse_detections(frames)
+
+    assert frames == original
+    assert fused[0]["frame_index"] == 7200
+    merged, other = fused[0]["objects"]
+    assert other == frames[0]["objects"][2]
+    assert merged["source"] == "right"
+    assert merged["team_index"] == 1
+    assert merged["confidence"] == 0.9
+    # The weighted center is stored back in right-camera coordinates.
+    assert _plane_x(merged) == pytest.approx((340.0 * 0.6 + 343.0 * 0.9) / 1.5)
+    assert merged["transformed_center"][1] == pytest.approx(
+        (100.0 * 0.6 + 102.0 * 0.9) / 1.5
+    )
+
+
+def test_only_mutual_nearest_pairs_are_merged():
+    # The right detection is closest to the second left one, so the first
+    # left detection is not its duplicate even though it is within range.
+    frames = [
+        {
+            "frame_index": 7200,
+            "objects": [
+                _obj(338.0, 100.0, "left", 0.9, 0),
+                _obj(344.0, 100.0, "left", 0.5, 1),
+                _obj(345.0, 100.0, "right", 0.7, 1),
+            ],
+        }
+    ]
+    fused = fuse_detections(frames)[0]["objects"]
+
+    assert len(fused) == 2
+    assert fused[0] == frames[0]["objects"][0]
+    assert fused[1]["source"] == "right"
+    assert _plane_x(fused[1]) == pytest.approx((344.0 * 0.5 + 345.0 * 0.7) / 1.2)
+
+
+def test_zero_confidence_pair_is_averaged():
+    frames = [
+        {
+            "frame_index": 7200,
+            "objects": [
+                _obj(340.0, 100.0, "left", 0.0, 0),
+                _obj(344.0, 104.0, "right", 0.0, 0),
+            ],
+        }
+    ]
+    (merged,) = fuse_detections(frames)[0]["objects"]
+
+    assert _plane_x(merged) == pytest.approx(342.0)
+    assert merged["transformed_center"][1] == pytest.approx(102.0)
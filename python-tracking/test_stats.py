@@ -0,0 +1,40 @@
+import numpy as np
+
+from stats import METRES_PER_UNIT, compute_player_stats, compute_sample_stats
+
+FPS = 25.0
+
+
+def _constant_velocity(speed, samples, players=2, gap=0):
+    """Players running in a straight line at `speed` m/s. With a `gap`,
+    every player's track is missing that many frames halfway through."""
+    frames, ids, points = [], [], []
+    step = speed / FPS / METRES_PER_UNIT
+    for player in range(players):
+        frame = np.arange(samples)
+        frame[samples // 2 :] += gap
+        frames.append(frame)
+        ids.append(np.full(samples, player))
+        points.append(
+            np.column_stack([100.0 + step * frame, np.full(samples, 50.0 + 100 * player)])
+        )
+    frames, ids, points = (np.concatenate(a) for a in (frames, ids, points))
+    return frames, ids, points, ids % 2
+
+
+def test_constant_velocity_has_no_accelerations():
+    speed = 3.57
+    stats = compute_sample_stats(*_constant_velocity(speed, 200, gap=5), FPS)
+    for player in stats["players"]:
+        assert player["accelerations"] == 0
+        assert player["decelerations"] == 0
+        assert player["max_acceleration"] == 0.0
+        assert player["max_deceleration"] == 0.0
+        assert player["max_speed"] == speed
+        assert player["distance"] == round(speed * (200 + 5 - 1) / FPS, 1)
+
+
+def test_no_samples():
+    empty = {"players": [], "teams": [], "heatmap_shape": [8, 12]}
+    assert compute_player_stats([]) == empty
+    assert compute_player_stats([{"fr": 1, "obj": []}]) == empty
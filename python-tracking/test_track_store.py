@@ -0,0 +1,62 @@
+import numpy as np
+
+from track_store import TrackStore, handle_query
+from transform_utility import reverse_transform_point
+
+
+def _store(frames=20, players=12, seed=0):
+    """A store of players scattered over the whole pitch, with the image
+    coordinates format_tracking_data would produce."""
+    rng = np.random.default_rng(seed)
+    tracks = []
+    for fr in range(frames):
+        objects = []
+        for player in range(players):
+            isRight, c = reverse_transform_point(rng.uniform([5, 5], [689, 445]).tolist())
+            objects.append({"id": player, "cls_id": player % 2, "c": c, "src": int(isRight)})
+        tracks.append({"fr": fr, "obj": objects})
+    store = TrackStore()
+    store.append(tracks)
+    return store, tracks
+
+
+def _expected(tracks, region, src, start, end):
+    x0, y0, x1, y1 = region
+    counts = {}
+    for frame in tracks[start : end + 1]:
+        for obj in frame["obj"]:
+            x, y = obj["c"]
+            if obj["src"] == src and x0 <= x <= x1 and y0 <= y <= y1:
+                counts[obj["id"]] = counts.get(obj["id"], 0) + 1
+    return counts
+
+
+def test_image_region_across_the_horizon():
+    store, tracks = _store()
+    for src in (0, 1):
+        for region in ([0, 0, 1920, 1080], [200, 300, 1700, 1000]):
+            expected = _expected(tracks, region, src, 3, 15)
+            assert expected
+            assert store.in_region(*region, 3, 15, src) == expected
+            query = {
+                "query_id": 4,
+                "type": "region",
+                "region": region,
+                "src": src,
+                "start_frame": 3,
+                "end_frame": 15,
+            }
+            result = handle_query(store, query)
+            assert result == {"query_id": 4, "ids": sorted(expected)}
+
+
+def test_malformed_query_returns_error():
+    store, _ = _store(frames=2)
+    for query in (
+        {"query_id": 7, "type": "region", "region": None, "start_frame": 0, "end_frame": 1},
+        {"query_id": 7, "type": "positions", "ids": None, "start_frame": 0, "end_frame": 1},
+        {"query_id": 7, "type": "nearest", "c": None, "src": 0, "start_frame": 0},
+    ):
+        result = handle_query(store, query)
+        assert set(result) == {"query_id", "error"}
+        assert result["query_id"] == 7
@@ -0,0 +1,323 @@
+import os
+
+import numpy as np
+
+from transform_utility import transform_points
+
+GRID_CELL_SIZE = 25.0  # Tracker plane units per spatial index cell
+GRID_SHAPE = (24, 32)  # rows x cols; covers the 694-unit-long plane with margin
+
+
+class _Columns:
+    """Parallel arrays with amortized O(1) appends and O(1) truncation."""
+
+    def __init__(self, columns):
+        self._buffers = dict(columns)
+        self.size = len(next(iter(self._buffers.values())))
+
+    def __getitem__(self, name):
+        return self._buffers[name][: self.size]
+
+    def append(self, rows):
+        size = self.size + len(next(iter(rows.values())))
+        for name, values in rows.items():
+            buffer = self._buffers[name]
+            if size > len(buffer):
+                grown = np.empty(
+                    (max(size, 2 * len(buffer)),) + buffer.shape[1:], buffer.dtype
+                )
+                grown[: self.size] = buffer[: self.size]
+                self._buffers[name] = buffer = grown
+            buffer[self.size : size] = values
+        self.size = size
+
+    def truncate(self, size):
+        self.size = min(self.size, size)
+
+
+class TrackStore:
+    """Persistent store of confirmed tracks with time and space indexes.
+
+    Every track point is kept twice. Per-ID time-sorted arrays answer
+    position lookups with a binary search. A flat spatial index sorted by
+    frame * cells + cell answers region and nearest-track lookups by
+    binary-searching only the cells a query touches. Points are indexed in
+    the tracker plane, so both cameras share one grid. The original "c"
+    and "src" are returned for display.
+    """
+
+    _FIELDS = ("frames", "ids", "points", "coords", "srcs", "classes")
+
+    def __init__(self, path=None):
+        """
+        :param path: Optional .npz file. It is loaded if it exists, and
+            save() writes to it.
+        """
+        self.path = path
+        self._tracks = {}  # {id: _Columns} sorted by frame
+        self._index = self._empty_columns(("keys",) + self._FIELDS)
+        if path and os.path.exists(path):
+            with np.load(path) as data:
+                self._extend({field: data[field] for field in self._FIELDS})
+
+    @staticmethod
+    def _empty_columns(fields):
+        return _Columns(
+            {
+                field: np.empty((0, 2), dtype=np.float64)
+                if field in ("points", "coords")
+                else np.empty(0, dtype=np.int64)
+                for field in fields
+            }
+        )
+
+    @staticmethod
+    def _cells(points):
+        rows, cols = GRID_SHAPE
+        col = np.clip((points[:, 0] // GRID_CELL_SIZE).astype(np.int64), 0, cols - 1)
+        row = np.clip((points[:, 1] // GRID_CELL_SIZE).astype(np.int64), 0, rows - 1)
+        return row * cols + col
+
+    @staticmethod
+    def _key(frames, cells):
+        return frames * (GRID_SHAPE[0] * GRID_SHAPE[1]) + cells
+
+    def __len__(self):
+        return self._index.size
+
+    def append(self, tracks):
+        """Add a chunk of formatted tracks.
+
+        Anything already stored from the chunk's first frame onwards is
+        replaced, so re-tracking from a corrected frame overwrites the old
+        tail instead of duplicating it.
+
+        :param tracks: Formatted tracking output (list of {"fr", "obj"}).
+        """
+        objects = [(frame["fr"], obj) for frame in tracks for obj in frame["obj"]]
+        if not objects:
+            return
+        coords = np.array([obj["c"] for _, obj in objects], dtype=np.float64)
+        srcs = np.array([obj["src"] for _, obj in objects], dtype=np.int64)
+        data = {
+            "frames": np.array([fr for fr, _ in objects], dtype=np.int64),
+            "ids": np.array([obj["id"] for _, obj in objects], dtype=np.int64),
+            "points": transform_points(coords, srcs),
+            "coords": coords,
+            "srcs": srcs,
+            "classes": np.array([obj["cls_id"] for _, obj in objects], dtype=np.int64),
+        }
+        self.truncate(int(data["frames"].min()))
+        self._extend(data)
+
+    def truncate(self, frame):
+        """Drop everything stored at or after `frame`."""
+        for track in self._tracks.values():
+            track.truncate(np.searchsorted(track["frames"], frame, side="left"))
+        self._index.truncate(
+            np.searchsorted(self._index["keys"], self._key(frame, 0), side="left")
+        )
+
+    def _extend(self, data):
+        # New data always starts after the stored data, so sorting only the
+        # new rows and appending keeps every array sorted.
+        keys = self._key(data["frames"], self._cells(data["points"]))
+        order = np.argsort(keys, kind="stable")
+        self._index.append(
+            {"keys": keys[order], **{field: data[field][order] for field in self._FIELDS}}
+        )
+
+        order = np.lexsort((data["frames"], data["ids"]))
+        ids = data["ids"][order]
+        bounds = np.flatnonzero(np.diff(ids)) + 1
+        for start, end in zip(
+            np.concatenate([[0], bounds]), np.concatenate([bounds, [len(ids)]])
+        ):
+            track_id = int(ids[start])
+            if track_id not in self._tracks:
+                self._tracks[track_id] = self._empty_columns(self._FIELDS)
+            rows = order[start:end]
+            self._tracks[track_id].append(
+                {field: data[field][rows] for field in self._FIELDS}
+            )
+
+    def save(self, path=None):
+        """Write the store to an .npz file."""
+        np.savez(
+            path or self.path, **{field: self._index[field] for field in self._FIELDS}
+        )
+
+    def samples(self):
+        """Every stored track point as (frames, ids, points, classes).
+
+        Rows are in index order (by frame, then grid cell); points are in
+        the tracker plane, as returned by metrics.flatten_tracks.
+        """
+        return tuple(self._index[field] for field in ("frames", "ids", "points", "classes"))
+
+    def positions(self, ids, start_frame, end_frame):
+        """Positions of the given ids over frames [start_frame, end_frame].
+
+        :return: {id: {"frames", "coords", "srcs", "points", "classes"}}
+            with one row per stored frame in the window.
+        """
+        result = {}
+        for track_id in ids:
+            track = self._tracks.get(int(track_id))
+            if track is None:
+                continue
+            start = np.searchsorted(track["frames"], start_frame, side="left")
+            end = np.searchsorted(track["frames"], end_frame, side="right")
+            result[int(track_id)] = {
+                field: track[field][start:end]
+                for field in ("frames", "coords", "srcs", "points", "classes")
+            }
+        return result
+
+    def in_region(self, x0, y0, x1, y1, start_frame, end_frame, src=None):
+        """Ids inside a rectangle during a frame window.
+
+        :param x0, y0, x1, y1: Rectangle corners in tracker plane units, or
+            image coordinates on camera `src` (as drawn in Unity).
+        :param start_frame, end_frame: Inclusive frame window.
+        :param src: Source camera of image coordinates.
+        :return: {id: number of frames spent inside the rectangle}.
+        """
+        corners = np.array([[min(x0, x1), min(y0, y1)], [max(x0, x1), max(y0, y1)]])
+        if src is not None:
+            # An image rectangle can reach above the homography's horizon,
+            # where it has no bounded shape on the plane. Test the stored
+            # image coordinates of that camera's points instead.
+            start = np.searchsorted(self._index["keys"], self._key(start_frame, 0), side="left")
+            end = np.searchsorted(self._index["keys"], self._key(end_frame + 1, 0), side="left")
+            candidates = np.arange(start, end)
+            candidates = candidates[self._index["srcs"][candidates] == src]
+            points = self._index["coords"][candidates]
+        else:
+            rows, cols = GRID_SHAPE
+            (low_cell, high_cell) = self._cells(corners)
+            row_range = np.arange(low_cell // cols, high_cell // cols + 1)
+            frames = np.arange(start_frame, end_frame + 1)
+
+            # One contiguous key range per (frame, grid row) the rectangle covers.
+            row_keys = self._key(frames[:, None], row_range[None, :] * cols).ravel()
+            starts = np.searchsorted(self._index["keys"], row_keys + low_cell % cols, side="left")
+            ends = np.searchsorted(self._index["keys"], row_keys + high_cell % cols, side="right")
+            counts = ends - starts
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            candidates = np.repeat(starts, counts) + offsets
+            points = self._index["points"][candidates]
+
+        inside = (
+            (points[:, 0] >= corners[0, 0])
+            & (points[:, 0] <= corners[1, 0])
+            & (points[:, 1] >= corners[0, 1])
+            & (points[:, 1] <= corners[1, 1])
+        )
+        ids, frame_counts = np.unique(
+            self._index["ids"][candidates[inside]], return_counts=True
+        )
+        return {int(i): int(n) for i, n in zip(ids, frame_counts)}
+
+    def nearest(self, point, frame, src=None):
+        """Track closest to a point at a frame.
+
+        :param point: [x, y] in tracker plane units, or an image coordinate
+            when `src` is given (as sent for a click in Unity).
+        :param frame: Frame to search.
+        :param src: Source camera of an image coordinate.
+        :return: (row, distance) where row is a dict with "id", "cls_id",
+            "c" and "src", or (None, inf) if nothing is stored at `frame`.
+        """
+        if src is not None:
+            point = transform_points([point], src)[0]
+        point = np.asarray(point, dtype=np.float64)
+        rows, cols = GRID_SHAPE
+        cell = self._cells(point[None, :])[0]
+        row, col = divmod(cell, cols)
+
+        # The 3x3 block around the point holds the nearest track whenever
+        # it is within one cell size; otherwise scan the whole frame.
+        block_rows = np.arange(max(row - 1, 0), min(row + 1, rows - 1) + 1)
+        row_keys = self._key(frame, block_rows * cols)
+        starts = np.searchsorted(self._index["keys"], row_keys + max(col - 1, 0), side="left")
+        ends = np.searchsorted(
+            self._index["keys"], row_keys + min(col + 1, cols - 1), side="right"
+        )
+        candidates = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+        best, distance = self._closest(candidates, point)
+        if best is None or distance > GRID_CELL_SIZE:
+            start = np.searchsorted(self._index["keys"], self._key(frame, 0), side="left")
+            end = np.searchsorted(self._index["keys"], self._key(frame + 1, 0), side="left")
+            best, distance = self._closest(np.arange(start, end), point)
+        if best is None:
+            return None, float("inf")
+        return {
+            "id": int(self._index["ids"][best]),
+            "cls_id": int(self._index["classes"][best]),
+            "c": self._index["coords"][best].tolist(),
+            "src": int(self._index["srcs"][best]),
+        }, distance
+
+    def _closest(self, candidates, point):
+        if len(candidates) == 0:
+            return None, float("inf")
+        distances = np.linalg.norm(self._index["points"][candidates] - point, axis=1)
+        i = int(np.argmin(distances))
+        return int(candidates[i]), float(distances[i])
+
+
+def handle_query(store, query):
+    """Answer a TrackQuery from Unity with a TrackQueryResult dict.
+
+    :param store: The TrackStore to query.
+    :param query: {"query_id", "type", ...} where type is "positions"
+        (ids, start_frame, end_frame), "region" (region as image
+        [x0, y0, x1, y1] in camera src, start_frame, end_frame) or
+        "nearest" (c, src, start_frame).
+    :return: A dict matching the TrackQueryResult struct, with only
+        "query_id" and "error" set if the query could not be answered.
+    """
+    result = {"query_id": query.get("query_id")}
+    query_type = query.get("type")
+    try:
+        if query_type == "positions":
+            frames = {}
+            for track_id, track in store.positions(
+                query["ids"], query["start_frame"], query["end_frame"]
+            ).items():
+                for fr, c, src, cls_id in zip(
+                    track["frames"], track["coords"], track["srcs"], track["classes"]
+                ):
+                    frames.setdefault(int(fr), []).append(
+                        {
+                            "id": track_id,
+                            "cls_id": int(cls_id),
+                            "c": c.tolist(),
+                            "src": int(src),
+                        }
+                    )
+            result["tracks"] = [{"fr": fr, "obj": frames[fr]} for fr in sorted(frames)]
+        elif query_type == "region":
+            result["ids"] = list(
+                store.in_region(
+                    *query["region"],
+                    query["start_frame"],
+                    query["end_frame"],
+                    query.get("src"),
+                )
+            )
+        elif query_type == "nearest":
+            nearest, distance = store.nearest(
+                query["c"], query["start_frame"], query.get("src")
+            )
+            if nearest is not None:
+                result["nearest"] = nearest
+                result["distance"] = distance
+        else:
+            result["error"] = f"Unknown query type: {query_type}"
+    except Exception as e:
+        # A malformed query, such as one with a field Unity left null, is
+        # answered with an error instead of taking the daemon down.
+        return {"query_id": result["query_id"], "error": f"Bad {query_type} query: {e!r}"}
+    return result
@@ -1,33 +1,86 @@
 import json
+from bisect import bisect_left
 
 import numpy as np
-import supervision as sv  # Includes ByteTrack implementation
 
+from fusion import fuse_detections
 from transform_utility import reverse_transform_point, transform_point
 
 CHUNK_LENGTH = 1800
-
-
-def update(start_frame, coord_ids):
+DETECTIONS_PATH = "radon.json"
+
+# Default tracker configuration; perform_tracking_from_json accepts overrides.
+TRACKER_PARAMS = {
+    # ByteTrack parameters
+    "track_activation_threshold": 0.1,
+    "minimum_matching_threshold": 0.98,
+    "lost_track_buffer": 10,
+    "frame_rate": 59,
+    "minimum_consecutive_frames": 1,
+    # Max distance for handing a free internal id to a new track
+    "reid_distance": 28,
+    # Frames without an update before a track is marked lost
+    "lost_frames": 10,
+    # Frames a track may stay lost before it is reported to the operator
+    "lost_report_frames": 120,
+    # Adaptive rate: track every Nth frame through calm stretches (1 = off)
+    "adaptive_stride": 1,
+    # A frame is calm when no two detections are closer than this ...
+    "adaptive_crowding_distance": 10,
+    # ... no detection moved further than this since the previous frame ...
+    "adaptive_max_motion": 1.0,
+    # ... and every detection is at least this confident.
+    "adaptive_min_confidence": 0.3,
+}
+
+# Parsed detection files, {(path, fuse): (frames sorted by index, frame indices)}
+_detections = {}
+
+
+def load_detections(path=DETECTIONS_PATH, fuse=True):
+    """Parse a detection file once and keep it for later updates.
+
+    The cached frames are shared by every update and must not be modified.
+
+    :param path: Path to the detection JSON.
+    :param fuse: Merge players seen by both cameras in the overlap band
+        (see fusion.fuse_detections).
+    :return: A tuple (input_data, frame_indices) with the frames sorted by
+        "frame_index" and the matching list of indices for bisecting.
+    """
+    if (path, fuse) not in _detections:
+        with open(path) as f:
+            input_data = json.load(f)
+        if fuse:
+            input_data = fuse_detections(input_data)
+        input_data.sort(key=lambda frame: frame.get("frame_index", 0))
+        frame_indices = [frame.get("frame_index", 0) for frame in input_data]
+        _detections[(path, fuse)] = (input_data, frame_indices)
+    return _detections[(path, fuse)]
+
+
+def update(start_frame, coord_ids, params=None):
     """Update the start mapping based on coord_ids, filter the JSON data, and
     then perform tracking with the filtered data.
 
     :param start_frame: The frame index from which to start processing.
     :param coord_ids: A dictionary mapping 2D coordinate arrays (or
         string representations of them) to an integer id.
+    :param params: Optional overrides for TRACKER_PARAMS.
     :return: A tuple (frame_index, lost_ids, tracking_result) where
         tracking_result is a JSON-like dict.
     """
-    # Load original JSON from disk
-    with open("radon.json") as f:
-        input_data = json.load(f)
+    # Load original JSON from disk, or reuse it if it is already parsed
+    input_data, frame_indices = load_detections()
 
     # Find the start frame data
-    start_frame_data = next(
-        (frame for frame in input_data if frame.get("frame_index") == start_frame), None
-    )
-    if start_frame_data is None:
+    start_position = bisect_left(frame_indices, start_frame)
+    if (
+        start_position == len(frame_indices)
+        or frame_indices[start_position] != start_frame
+    ):
         raise ValueError(f"Start frame {start_frame} not found in radon.json")
+    start_frame_data = input_data[start_position]
 
     # Create start_map: mapping from object index in the start frame to the assigned id
     start_map = {}  # {object_index: assigned_id}
@@ -122,34 +175,169 @@ def update(start_frame, coord_ids):
         #     start_map[new_index] = assigned_id
 
     # Filter the JSON data to include only frames in the desired range
-    filtered_data = [
-        frame
-        for frame in input_data
-        if start_frame <= frame.get("frame_index", 0) < start_frame + CHUNK_LENGTH
-    ]
+    end_position = bisect_left(frame_indices, start_frame + CHUNK_LENGTH)
+    filtered_data = input_data[start_position:end_position]
 
     # Feed the filtered JSON data (in-memory) along with the start_map to the tracker
-    return perform_tracking_from_json(filtered_data, start_frame, start_map)
+    return perform_tracking_from_json(filtered_data, start_frame, start_map, params)
+
+
+def _frame_pairs(rows, begin, count):
+    """Pair each row with `count` consecutive rows starting at `begin`."""
+    offsets = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    return np.repeat(rows, count), np.repeat(begin, count) + offsets
+
+
+def calm_frames(input_data, params):
+    """Flag the frames that adaptive tracking may skip.
+
+    A frame is calm when nobody is within the crowding distance of anyone
+    else, no detection moved more than the max motion since the previous
+    frame, every detection is confident enough, and no detection appeared
+    or disappeared. Motion is measured to the nearest detection of the
+    previous frame when that is within the crowding distance, so it can
+    only be the same player. A detection of the previous frame with no
+    such neighbour has disappeared, as has one lost to a change in the
+    detection count. Frames within one stride of a frame that is not calm
+    are not calm either, so close encounters and lost detections are
+    tracked at full rate.
+
+    :param input_data: List of frame detection dictionaries.
+    :param params: Full tracker parameters.
+    :return: A boolean array with one entry per frame of input_data.
+    """
+    frames = len(input_data)
+    counts = np.array([len(frame["objects"]) for frame in input_data], dtype=np.int64)
+    objects = [obj for frame in input_data for obj in frame["objects"]]
+    positions = np.repeat(np.arange(frames), counts)
+    starts = np.cumsum(counts) - counts
+    points = np.array(
+        [obj["transformed_center"] for obj in objects], dtype=np.float64
+    ).reshape(-1, 2)
+    points[[obj["source"] == "right" for obj in objects], 0] += 347
+    confidence = np.array([obj["confidence"] for obj in objects], dtype=np.float64)
+    rows = np.arange(len(objects))
+
+    # Closest pair of detections within each frame.
+    a, b = _frame_pairs(rows, starts[positions], counts[positions])
+    distinct = a != b
+    a, b = a[distinct], b[distinct]
+    crowding = np.full(frames, np.inf)
+    np.minimum.at(
+        crowding, positions[a], np.linalg.norm(points[a] - points[b], axis=1)
+    )
+
+    # Largest move of any detection to its nearest detection a frame earlier.
+    later = positions > 0
+    a, b = _frame_pairs(
+        rows[later], starts[positions[later] - 1], counts[positions[later] - 1]
+    )
+    nearest = np.full(len(objects), np.inf)
+    np.minimum.at(nearest, a, np.linalg.norm(points[a] - points[b], axis=1))
+    nearest[~later | (nearest > params["adaptive_crowding_distance"])] = 0.0
+    motion = np.zeros(frames)
+    np.maximum.at(motion, positions, nearest)
+
+    # Detections of the previous frame with no neighbour in this frame.
+    earlier = positions < frames - 1
+    a, b = _frame_pairs(
+        rows[earlier], starts[positions[earlier] + 1], counts[positions[earlier] + 1]
+    )
+    following = np.full(len(objects), np.inf)
+    np.minimum.at(following, a, np.linalg.norm(points[a] - points[b], axis=1))
+    vanished = np.zeros(frames, dtype=bool)
+    vanished[
+        positions[earlier & (following > params["adaptive_crowding_distance"])] + 1
+    ] = True
+    vanished[1:] |= np.diff(counts) != 0
+
+    lowest_confidence = np.full(frames, np.inf)
+    np.minimum.at(lowest_confidence, positions, confidence)
+
+    unsafe = (
+        (crowding <= params["adaptive_crowding_distance"])
+        | (motion > params["adaptive_max_motion"])
+        | (lowest_confidence < params["adaptive_min_confidence"])
+        | vanished
+    )
+    # Spread every unsafe frame over one stride on both sides.
+    stride = params["adaptive_stride"]
+    cumulative = np.concatenate([[0], np.cumsum(unsafe)])
+    index = np.arange(frames)
+    lo = np.maximum(index - stride, 0)
+    hi = np.minimum(index + stride + 1, frames)
+    return cumulative[hi] - cumulative[lo] == 0
+
 
+def interpolate_frames(previous, current, frame_indices):
+    """Build tracking data for skipped frames between two tracked frames.
 
-def perform_tracking_from_json(input_data, start_frame, start_map):
+    Tracks present in both frames move linearly; tracks only in `previous`
+    hold their position, like any other track without a fresh update.
+
+    :param previous: Tracking data of the last tracked frame.
+    :param current: Tracking data of the frame just tracked.
+    :param frame_indices: Indices of the skipped frames in between.
+    :return: A list of frame tracking dicts, one per skipped frame.
+    """
+    span = current["frame_index"] - previous["frame_index"]
+    current_centers = {obj["track_id"]: obj["center"] for obj in current["objects"]}
+    frames = []
+    for frame_index in frame_indices:
+        t = (frame_index - previous["frame_index"]) / span
+        objects = []
+        for obj in previous["objects"]:
+            start = obj["center"]
+            end = current_centers.get(obj["track_id"], start)
+            center = [start[0] + (end[0] - start[0]) * t, start[1] + (end[1] - start[1]) * t]
+            objects.append(
+                {
+                    "track_id": obj["track_id"],
+                    "class_id": obj["class_id"],
+                    "confidence": 0.0,
+                    "bbox": [center[0] - 2.5, center[1] - 2.5, center[0] + 2.5, center[1] + 2.5],
+                    "center": center,
+                }
+            )
+        frames.append({"frame_index": frame_index, "objects": objects})
+    return frames
+
+
+def report_speedup(frames, tracked_frames):
+    """Print how many frames adaptive tracking actually ran ByteTrack on."""
+    print(
+        f"Adaptive tracking: ByteTrack ran on {tracked_frames} of {frames} frames",
+        f"({frames / max(tracked_frames, 1):.2f}x speedup)",
+    )
+
+
+def perform_tracking_from_json(input_data, start_frame, start_map, params=None):
     """Perform tracking using ByteTrack based on bounding box information from
     input_data.
 
-    :param input_data: List of frame detection dictionaries.
+    :param input_data: List of frame detection dictionaries. It is not
+        modified, so the same data can be tracked repeatedly.
     :param start_frame: The starting frame index.
     :param start_map: Mapping from start frame's object indices to an
         assigned id.
+    :param params: Optional overrides for TRACKER_PARAMS. With an
+        "adaptive_stride" above 1, ByteTrack only sees every Nth frame while
+        the scene is calm (see calm_frames) and every track is healthy; the
+        frames in between are interpolated.
     :return: A tuple (last_frame_index, lost_ids, tracking_result) where
         tracking_result is a JSON-like dict.
     """
+    import supervision as sv  # Includes ByteTrack; imported on first use
+
+    params = {**TRACKER_PARAMS, **(params or {})}
+
     # Initialize ByteTrack
     tracker = sv.ByteTrack(
-        track_activation_threshold=0.1,
-        minimum_matching_threshold=0.98,
-        lost_track_buffer=10,
-        frame_rate=59,
-        minimum_consecutive_frames=1,
+        track_activation_threshold=params["track_activation_threshold"],
+        minimum_matching_threshold=params["minimum_matching_threshold"],
+        lost_track_buffer=params["lost_track_buffer"],
+        frame_rate=params["frame_rate"],
+        minimum_consecutive_frames=params["minimum_consecutive_frames"],
     )
 
     # Tracking management variables
@@ -163,24 +351,32 @@ def perform_tracking_from_json(input_data, start_frame, start_map):
     lost_array = set()
     tracking_data = []
 
-    for frame_data in input_data:
+    # Adaptive rate state
+    stride = params["adaptive_stride"]
+    calm = calm_frames(input_data, params) if stride > 1 else None
+    next_position = 0
+    skipped = []
+    tracked_frames = 0
+
+    for position, frame_data in enumerate(input_data):
         frame_count += 1
         frame_index = frame_data["frame_index"]
         detections = frame_data["objects"]
 
+        if position < next_position:
+            skipped.append(frame_index)
+            continue
+        tracked_frames += 1
+
         bboxes = []
         confidences = []
         class_ids = []
         for obj in detections:
             # Adjust x coordinate for detections coming from "right" if needed
+            x, y = obj["transformed_center"]
             if obj["source"] == "right":
-                obj["transformed_center"][0] += 347
-            bbox = [
-                obj["transformed_center"][0] - 2.5,
-                obj["transformed_center"][1] - 2.5,
-                obj["transformed_center"][0] + 2.5,
-                obj["transformed_center"][1] + 2.5,
-            ]
+                x += 347
+            bbox = [x - 2.5, y - 2.5, x + 2.5, y + 2.5]
             bboxes.append(bbox)
             class_ids.append(obj.get("team_index", -1))
             confidences.append(obj["confidence"])
@@ -234,7 +430,7 @@ def perform_tracking_from_json(input_data, start_frame, start_map):
                     if len(distances) == 0:
                         continue
                     min_id, min_distance = min(distances, key=lambda x: x[1])
-                    if min_distance > 28:  # Threshold for matching distance
+                    if min_distance > params["reid_distance"]:
                         continue
                     internal_id = min_id
                     reusable_ids.remove(internal_id)
@@ -308,7 +504,7 @@ def perform_tracking_from_json(input_data, start_frame, start_map):
             if not data["active"]:
                 if internal_id not in reusable_ids:
                     lost = True
-            elif frame_count - data["frame_count"] > 10:
+            elif frame_count - data["frame_count"] > params["lost_frames"]:
                 lost = True
 
             if lost:
@@ -324,12 +520,18 @@ def perform_tracking_from_json(input_data, start_frame, start_map):
         for i in range(23):
             if (i + 1) in active_tracks and not active_tracks[i + 1]["active"]:
                 lost_tracker[i] += 1
-                if lost_tracker[i] > 120:
+                if lost_tracker[i] > params["lost_report_frames"]:
                     print("Lost for 1 second, index=", i + 1, "at frame", frame_index)
                     lost_array.add(i + 1)
             else:
                 lost_tracker[i] = 0
 
+        if skipped:
+            tracking_data.extend(
+                interpolate_frames(tracking_data[-1], frame_tracking_data, skipped)
+            )
+            skipped = []
+
         if len(lost_array) > 0:
             # Iterate through all tracks in active_tracks
             for internal_id, data in active_tracks.items():
@@ -374,6 +576,8 @@ def perform_tracking_from_json(input_data, start_frame, start_map):
                 key=lambda track_id: lost_tracker[track_id - 1],
                 reverse=True,
             )
+            if stride > 1:
+                report_speedup(position + 1, tracked_frames)
             return frame_index, sorted_lost_array, format_tracking_data(tracking_data)
 
         else:
@@ -384,9 +588,27 @@ def perform_tracking_from_json(input_data, start_frame, start_map):
         )
         active_track_counts.append((frame_index, current_active_count))
 
+        # Jump a full stride only over calm frames while every track is
+        # active and matched in this frame. A track then stays matched
+        # through the stride, so its frame_count is refreshed at the far
+        # end, and a loss is still caught on the exact frame.
+        next_position = position + 1
+        if (
+            stride > 1
+            and position + stride < len(input_data)
+            and calm[position + 1 : position + stride].all()
+            and all(
+                data["active"] and internal_id in updated_tracks
+                for internal_id, data in active_tracks.items()
+            )
+        ):
+            next_position = position + stride
+
     sorted_lost_array = sorted(
         lost_array, key=lambda track_id: lost_tracker[track_id - 1], reverse=True
     )
+    if stride > 1:
+        report_speedup(len(input_data), tracked_frames)
     return frame_index, sorted_lost_array, format_tracking_data(tracking_data)
 
 
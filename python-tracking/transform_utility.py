@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import numpy as np
 
 
@@ -18,14 +20,10 @@ def reverse_transform_point(point):
     """
     x, y = point
     isRight = x > 347
-    # Select the appropriate homography matrix file based on the x-coordinate.
-    H = np.loadtxt(
-        "al1_homography_matrix.txt" if isRight else "al2_homography_matrix.txt"
-    )
     # If the point is from the right side, adjust x by subtracting 347.
     x_adjusted = x - 347 if isRight else x
-    # Compute the inverse of the homography matrix.
-    H_inv = np.linalg.inv(H)
+    # Select the inverse of the matching homography matrix.
+    H_inv = load_inverse_homography(1 if isRight else 0)
     # Convert the adjusted point to homogeneous coordinates.
     homogeneous_point = np.array([x_adjusted, y, 1])
     # Apply the inverse transformation.
@@ -55,11 +53,7 @@ def transform_point(point, src):
         new_point (list): The forward-transformed [x, y] coordinate. If src==1, the x value is increased by 347.
     """
     # Load the appropriate homography matrix based on src
-    H = (
-        np.loadtxt("al2_homography_matrix.txt")
-        if src == 0
-        else np.loadtxt("al1_homography_matrix.txt")
-    )
+    H = load_homography(0 if src == 0 else 1)
 
     # Convert the input point to homogeneous coordinates
     homogeneous_point = np.array([point[0], point[1], 1])
@@ -77,6 +71,60 @@ def transform_point(point, src):
     return new_point
 
 
+@lru_cache(maxsize=None)
+def load_homography(src):
+    """
+    Loads the homography matrix for a source once and caches it.
+
+    Parameters:
+        src (int): Source indicator. 0 means "al2_homography_matrix.txt"; 1 means "al1_homography_matrix.txt".
+
+    Returns:
+        H (np.ndarray): The 3x3 homography matrix. Treat it as read-only.
+    """
+    return np.loadtxt(
+        "al2_homography_matrix.txt" if src == 0 else "al1_homography_matrix.txt"
+    )
+
+
+@lru_cache(maxsize=None)
+def load_inverse_homography(src):
+    """
+    Inverse of load_homography(src), computed once and cached.
+    """
+    return np.linalg.inv(load_homography(src))
+
+
+def transform_points(points, src):
+    """
+    Vectorized counterpart of transform_point for many points at once.
+
+    Parameters:
+        points (array-like): An (N, 2) array of [x, y] coordinates.
+        src (int or array-like): Source indicator for all points, or one per point. As in
+            transform_point, 0 selects "al2_homography_matrix.txt" and any other value
+            "al1_homography_matrix.txt".
+
+    Returns:
+        new_points (np.ndarray): An (N, 2) array of forward-transformed coordinates, with
+        347 added to the x value of every point whose src is 1.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    src = np.broadcast_to(np.asarray(src), (len(points),))
+    homogeneous = np.column_stack([points, np.ones(len(points))])
+
+    new_points = np.empty_like(points)
+    # Like transform_point: src 0 uses the al2 matrix, any other src al1.
+    for source, mask in ((0, src == 0), (1, src != 0)):
+        if not mask.any():
+            continue
+        transformed = homogeneous[mask] @ load_homography(source).T
+        new_points[mask] = transformed[:, :2] / transformed[:, 2:3]
+
+    new_points[src == 1, 0] += 347
+    return new_points
+
+
 # Example usage:
 # if __name__ == "__main__":
 #     with open("test.json", "r") as f: